@@ -2,18 +2,24 @@ from dotenv import load_dotenv
 import os
 import requests
 
-load_dotenv()
 
-base = os.getenv("OLLAMA_BASE_URL", "")
-model = os.getenv("OLLAMA_MODEL", "")
+def main() -> None:
+    load_dotenv()
 
-print("OLLAMA_BASE_URL:", base)
-print("OLLAMA_MODEL:", model)
+    base = os.getenv("OLLAMA_BASE_URL", "")
+    model = os.getenv("OLLAMA_MODEL", "")
 
-if not base:
-    raise SystemExit("Missing OLLAMA_BASE_URL in .env")
-if not model:
-    raise SystemExit("Missing OLLAMA_MODEL in .env")
+    print("OLLAMA_BASE_URL:", base)
+    print("OLLAMA_MODEL:", model)
 
-r = requests.get(f"{base}/api/tags", timeout=10)
-print("Ollama OK:", r.status_code == 200)
+    if not base:
+        raise SystemExit("Missing OLLAMA_BASE_URL in .env")
+    if not model:
+        raise SystemExit("Missing OLLAMA_MODEL in .env")
+
+    r = requests.get(f"{base}/api/tags", timeout=10)
+    print("Ollama OK:", r.status_code == 200)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,8 @@
 from dotenv import load_dotenv
+from functools import lru_cache
 from pydantic import BaseModel, Field
 import os
 
-load_dotenv()
-
 def _to_bool(v: str | None, default: bool = False) -> bool:
     if v is None:
         return default
@@ -39,6 +38,8 @@ class Settings(BaseModel):
     database_url: str = Field(default="sqlite:///data/digest.db")
     
     eval_max_items: int = Field(default=10)
+    # parallel LLM evaluation calls; also the soft rate limit on Ollama
+    eval_concurrency: int = Field(default=4)
     ollama_temperature: float = Field(default=0.1)
 
     telegram_enabled: bool = Field(default=False)
@@ -48,6 +49,10 @@ class Settings(BaseModel):
 
     ollama_embed_model: str = Field(default="nomic-embed-text")
     dedup_sim_threshold: float = Field(default=0.86)
+    # "flat" (exact), "hnsw" (approximate, sublinear for big corpora),
+    # "sq8" (int8-quantized, 4x smaller index file) or "ivfpq"
+    # (inverted lists + product quantization, smallest + fastest at scale)
+    faiss_index_type: str = Field(default="flat")
 
     genai_news_min_score: int = Field(default=65)
     product_ideas_min_score: int = Field(default=60)
@@ -73,14 +78,12 @@ class Settings(BaseModel):
     hn_blocklist: list[str] = Field(default_factory=list)
 
 
-_settings: Settings | None = None
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    global _settings
-    if _settings is not None:
-        return _settings
-
-    _settings = Settings(
+    # .env is read exactly once per process: the cache makes this body
+    # run a single time, so importing this module no longer hits the fs.
+    load_dotenv()
+    return Settings(
         ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
         ollama_model=os.getenv("OLLAMA_MODEL", "llama3.1:8b"),
         persona_genai_news_enabled=_to_bool(os.getenv("PERSONA_GENAI_NEWS_ENABLED"), True),
@@ -93,6 +96,7 @@ def get_settings() -> Settings:
         hn_keywords=_to_list(os.getenv("HN_KEYWORDS")),
         hn_blocklist=_to_list(os.getenv("HN_BLOCKLIST")),
         eval_max_items=_to_int(os.getenv("EVAL_MAX_ITEMS"), 10),
+        eval_concurrency=_to_int(os.getenv("EVAL_CONCURRENCY"), 4),
         ollama_temperature=_to_float(os.getenv("OLLAMA_TEMPERATURE"), 0.1),
         telegram_enabled=_to_bool(os.getenv("TELEGRAM_ENABLED"), False),
         telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN", ""),
@@ -100,6 +104,7 @@ def get_settings() -> Settings:
         log_file=os.getenv("LOG_FILE", "logs/run.log"),
         ollama_embed_model=os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text"),
         dedup_sim_threshold=float(os.getenv("DEDUP_SIM_THRESHOLD", "0.86")),
+        faiss_index_type=os.getenv("FAISS_INDEX_TYPE", "flat"),
 
         genai_news_min_score=int(os.getenv("GENAI_NEWS_MIN_SCORE", "65")),
         product_ideas_min_score=int(os.getenv("PRODUCT_IDEAS_MIN_SCORE", "60")),
@@ -110,4 +115,3 @@ def get_settings() -> Settings:
 
 
     )
-    return _settings
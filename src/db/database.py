@@ -1,29 +1,93 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 
 from src.config.settings import get_settings
 from src.db.models import Base
 
 _engine: Engine | None = None
 
+# Applied to every new SQLite connection: WAL lets readers run during
+# writes, synchronous=NORMAL halves fsyncs (safe under WAL), the rest
+# trade memory for fewer syscalls.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA foreign_keys=ON",
+)
+
 
 def get_engine() -> Engine:
     global _engine
     if _engine is None:
         s = get_settings()
-        _engine = create_engine(s.database_url, future=True)
+        # SQLite defaults to SingletonThreadPool, which serializes threads
+        # on one connection. With WAL enabled a real pool is safe and lets
+        # ingest workers and dedup reads use separate connections.
+        _engine = create_engine(
+            s.database_url,
+            future=True,
+            poolclass=QueuePool,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            connect_args={"check_same_thread": False},
+        )
+
+        @event.listens_for(_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            for pragma in _SQLITE_PRAGMAS:
+                cur.execute(pragma)
+            cur.close()
+
     return _engine
 
 
+def _migrate_existing_db(conn) -> None:
+    """
+    One-time, guarded upgrades for databases created before the current
+    schema. create_all skips tables that already exist, so columns and
+    indexes added to the models never reach an old data/digest.db
+    without this.
+    """
+    cols = {row[1] for row in conn.execute(text("PRAGMA table_info(items)"))}
+    if cols and "score" not in cols:
+        conn.execute(text("ALTER TABLE items ADD COLUMN score INTEGER"))
+
+    # IF NOT EXISTS makes these no-ops on fresh databases, where
+    # create_all already built them from the model metadata
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS ix_items_score ON items (score)",
+        "CREATE INDEX IF NOT EXISTS ix_items_created_at ON items (created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_items_source_created_at"
+        " ON items (source, created_at)",
+        # unique: required by the ON CONFLICT (item_id, persona) bulk insert
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_evaluations_item_persona"
+        " ON evaluations (item_id, persona)",
+        "CREATE INDEX IF NOT EXISTS ix_evaluations_digest"
+        " ON evaluations (persona, decision, score DESC, created_at DESC)",
+    ):
+        conn.execute(text(ddl))
+
+
 def init_db() -> None:
     """
-    Create tables (idempotent) and verify connectivity.
+    Create tables (idempotent), apply guarded migrations for databases
+    created under older schemas, and verify connectivity.
     """
     engine = get_engine()
 
     # Create all tables
     Base.metadata.create_all(engine)
 
+    with engine.begin() as conn:
+        _migrate_existing_db(conn)
+
     # Connectivity check
     with engine.connect() as conn:
         conn.execute(text("SELECT 1"))
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from sqlalchemy import (
-    String, Integer, DateTime, Text, JSON, UniqueConstraint, ForeignKey
+    String, Integer, DateTime, Text, JSON, UniqueConstraint, ForeignKey, Index, text
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy import LargeBinary
@@ -26,6 +26,10 @@ class Item(Base):
     text: Mapped[str | None] = mapped_column(Text, nullable=True)
     published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
+    # source engagement score (HN points), promoted out of metadata_json
+    # so filtering happens in SQL instead of decoding JSON per row
+    score: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+
     # store raw source-specific metadata (score, author, tags, etc.)
     metadata_json: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
 
@@ -37,7 +41,16 @@ class Item(Base):
         back_populates="item", cascade="all, delete-orphan"
     )
 
-    __table_args__ = (UniqueConstraint("url", name="uq_items_url"),)
+    # 0 or 1 element (item_id is unique on embeddings); eager-loadable so
+    # batch callers avoid a per-item existence query
+    embeddings: Mapped[list["Embedding"]] = relationship(back_populates="item")
+
+    __table_args__ = (
+        UniqueConstraint("url", name="uq_items_url"),
+        # ORDER BY created_at DESC LIMIT n becomes an index walk
+        Index("ix_items_created_at", "created_at"),
+        Index("ix_items_source_created_at", "source", "created_at"),
+    )
 
 
 class Evaluation(Base):
@@ -59,6 +72,23 @@ class Evaluation(Base):
 
     item: Mapped["Item"] = relationship(back_populates="evaluations")
 
+    # evaluations are looked up per (item, persona) in the run loop
+    # unique: lets eval writes use ON CONFLICT DO NOTHING instead of a
+    # per-item existence SELECT
+    __table_args__ = (
+        Index("ix_evaluations_item_persona", "item_id", "persona", unique=True),
+        # matches the digest query: equality on (persona, decision),
+        # then the ORDER BY columns, so the planner walks the index
+        # instead of filter + sort
+        Index(
+            "ix_evaluations_digest",
+            "persona",
+            "decision",
+            text("score DESC"),
+            text("created_at DESC"),
+        ),
+    )
+
 class Embedding(Base):
     __tablename__ = "embeddings"
 
@@ -79,6 +109,6 @@ class Embedding(Base):
     )
 
     # optional relationship (nice to have)
-    item: Mapped["Item"] = relationship()
+    item: Mapped["Item"] = relationship(back_populates="embeddings")
 
 
@@ -1,20 +1,42 @@
 from __future__ import annotations
 
+import hashlib
 import numpy as np
+from functools import lru_cache
+from pathlib import Path
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
 from src.config.settings import get_settings
 from src.db.models import Embedding, Item
 from src.services.ollama_client import OllamaClient
-from src.services.vector_index import build_index, save_index, load_index, search
+from src.services.vector_index import (
+    add_to_index,
+    build_index,
+    save_index,
+    load_index,
+    search,
+    search_batch,
+)
+
+
+@lru_cache(maxsize=1)
+def _client() -> OllamaClient:
+    # one client (and one HTTP session) for all dedup calls
+    return OllamaClient()
 
 
 def _pack(vec: list[float]) -> bytes:
-    return np.asarray(vec, dtype="float32").tobytes()
+    # float16 at rest: half the blob size, fine for cosine at our threshold
+    return np.asarray(vec, dtype="float16").tobytes()
 
 
-def _unpack(blob: bytes) -> list[float]:
-    return np.frombuffer(blob, dtype="float32").tolist()
+def _unpack(blob: bytes, dim: int) -> np.ndarray:
+    # rows written before the fp16 switch are float32 (4 bytes per dim)
+    if len(blob) == dim * 2:
+        return np.frombuffer(blob, dtype="float16").astype("float32")
+    return np.frombuffer(blob, dtype="float32")
 
 
 def embed_text(item: Item) -> str:
@@ -22,32 +44,181 @@ def embed_text(item: Item) -> str:
     return f"{item.title}\n{item.url}\n{(item.text or '')[:600]}"
 
 
+# On-disk embedding cache, keyed by content hash: a story that reappears
+# (fresh DB, re-ingest, dedup query) never hits the model twice.
+EMB_CACHE_DIR = Path("data/emb_cache")
+
+
+def _cache_key(item: Item) -> str:
+    return hashlib.sha256(f"{item.title}\n{item.url}".encode()).hexdigest()
+
+
+def _cache_get(key: str) -> np.ndarray | None:
+    path = EMB_CACHE_DIR / f"{key}.npy"
+    if not path.exists():
+        return None
+    try:
+        return np.load(path).astype("float32")
+    except (OSError, ValueError):
+        return None  # truncated/corrupt file -> just re-embed
+
+
+def _cache_put(key: str, vec: np.ndarray | list[float]) -> None:
+    EMB_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    np.save(EMB_CACHE_DIR / f"{key}.npy", np.asarray(vec, dtype="float16"))
+
+
+def _embed_item(item: Item) -> np.ndarray:
+    """Embed one item, going through the on-disk cache first."""
+    key = _cache_key(item)
+    vec = _cache_get(key)
+    if vec is None:
+        vec = _client().embed(embed_text(item))
+        _cache_put(key, vec)
+    return vec
+
+
 def ensure_item_embedding(session: Session, item: Item) -> None:
-    exists = session.query(Embedding).filter_by(item_id=item.id).first()
+    # presence probe only — never pulls the LargeBinary vector column
+    exists = (
+        session.execute(
+            select(literal(1)).where(Embedding.item_id == item.id).limit(1)
+        ).first()
+        is not None
+    )
     if exists:
         return
-    c = OllamaClient()
-    vec = c.embed(embed_text(item))
-    session.add(
-        Embedding(
-            item_id=item.id,
-            dim=len(vec),
-            vector=_pack(vec),
-        )
+    vec = _embed_item(item)
+    # conflict-safe: a concurrent writer beating us just means a no-op
+    stmt = (
+        insert(Embedding)
+        .values(item_id=item.id, dim=len(vec), vector=_pack(vec))
+        .on_conflict_do_nothing(index_elements=["item_id"])
     )
+    session.execute(stmt)
+
 
+def ensure_item_embeddings(session: Session, items: list[Item]) -> int:
+    """
+    Batched variant: one embedding request and one bulk insert for all
+    items that don't have an embedding yet. Returns how many were added.
+    """
+    if not items:
+        return 0
+
+    have = {
+        item_id
+        for (item_id,) in session.query(Embedding.item_id)
+        .filter(Embedding.item_id.in_([it.id for it in items]))
+        .all()
+    }
+    missing = [it for it in items if it.id not in have]
+    if not missing:
+        return 0
+
+    # cache hits drop out of the batch request; only truly new content
+    # goes to the model
+    vecs: list[np.ndarray | None] = []
+    uncached: list[tuple[int, Item, str]] = []
+    for i, it in enumerate(missing):
+        key = _cache_key(it)
+        vec = _cache_get(key)
+        vecs.append(vec)
+        if vec is None:
+            uncached.append((i, it, key))
+    if uncached:
+        fresh = _client().embed_batch([embed_text(it) for _, it, _ in uncached])
+        for (i, _, key), vec in zip(uncached, fresh):
+            vecs[i] = vec
+            _cache_put(key, vec)
+
+    rows = [
+        {"item_id": it.id, "dim": len(vec), "vector": _pack(vec)}
+        for it, vec in zip(missing, vecs)
+    ]
+    stmt = insert(Embedding).values(rows).on_conflict_do_nothing(index_elements=["item_id"])
+    session.execute(stmt)
+    return len(missing)
+
+
+def rebuild_faiss_index_from_db(session: Session, full: bool = False) -> None:
+    # Incremental path: the persisted ids array is the index membership
+    # set, so a normal run only loads and adds the embeddings not in it
+    # — O(new) instead of O(N). A max-id watermark would miss older
+    # items embedded late (candidates are capped per run, so that's
+    # routine). full=True forces the classic rebuild (index type change,
+    # deleted rows, periodic maintenance).
+    if not full:
+        index, ids_np = load_index()
+        if index is not None and len(ids_np):
+            indexed = {int(i) for i in ids_np}
+            missing_ids = [
+                item_id
+                for (item_id,) in session.query(Embedding.item_id).all()
+                if item_id not in indexed
+            ]
+            if not missing_ids:
+                return
+            rows = (
+                session.query(Embedding)
+                .filter(Embedding.item_id.in_(missing_ids))
+                .all()
+            )
+            mat = np.empty((len(rows), rows[0].dim), dtype="float32")
+            for i, r in enumerate(rows):
+                mat[i] = _unpack(r.vector, r.dim)
+            ids_np = add_to_index(index, ids_np, mat, [r.item_id for r in rows])
+            save_index(index, ids_np)
+            return
 
-def rebuild_faiss_index_from_db(session: Session) -> None:
     rows = session.query(Embedding).all()
     if not rows:
         return
-    vectors = [_unpack(r.vector) for r in rows]
+    # one contiguous float32 matrix instead of N Python float lists;
+    # legacy float32 rows are rewritten as fp16 while we have them loaded
+    migrated = False
+    mat = np.empty((len(rows), rows[0].dim), dtype="float32")
+    for i, r in enumerate(rows):
+        vec = _unpack(r.vector, r.dim)
+        mat[i] = vec
+        if len(r.vector) == r.dim * 4:
+            r.vector = _pack(vec)
+            migrated = True
+    if migrated:
+        session.commit()
     ids = [r.item_id for r in rows]
-    index, ids_np = build_index(vectors, ids)
+    index, ids_np = build_index(mat, ids)
     if index is not None:
         save_index(index, ids_np)
 
 
+def find_semantic_duplicates(
+    session: Session, items: list[Item]
+) -> dict[int, tuple[int, float]]:
+    """
+    Batch variant of is_semantic_duplicate: stacks the (cache-aware)
+    query embeddings into one matrix and runs a single FAISS search for
+    the whole candidate list. Returns {duplicate_item_id: (nearest_item_id,
+    similarity)} with the same nearest-hit semantics as the single-item path.
+    """
+    s = get_settings()
+    index, ids_np = load_index()
+    if index is None or not items:
+        return {}
+
+    Q = np.vstack([_embed_item(it) for it in items])
+    hit_lists = search_batch(index, ids_np, Q, k=5)
+
+    dups: dict[int, tuple[int, float]] = {}
+    for it, hits in zip(items, hit_lists):
+        if not hits:
+            continue
+        nearest_id, sim = hits[0]
+        if nearest_id != it.id and sim >= s.dedup_sim_threshold:
+            dups[it.id] = (nearest_id, sim)
+    return dups
+
+
 def is_semantic_duplicate(session: Session, item: Item) -> tuple[bool, int | None, float | None]:
     """
     Returns: (is_duplicate, nearest_item_id, similarity)
@@ -57,8 +228,7 @@ def is_semantic_duplicate(session: Session, item: Item) -> tuple[bool, int | Non
     if index is None:
         return (False, None, None)
 
-    c = OllamaClient()
-    q = c.embed(embed_text(item))
+    q = _embed_item(item)
     hits = search(index, ids_np, q, k=5)
     if not hits:
         return (False, None, None)
@@ -1,26 +1,62 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from dataclasses import asdict, dataclass
 from src.db.models import Item
 from src.services.ollama_client import OllamaClient
 
 
-class GenaiNewsEval(BaseModel):
-    relevance_score: int = Field(ge=0, le=100)
+def _score_0_100(value) -> int:
+    score = int(value)
+    if not 0 <= score <= 100:
+        raise ValueError(f"score out of range 0-100: {score}")
+    return score
+
+
+@dataclass(slots=True)
+class GenaiNewsEval:
+    relevance_score: int
     topic: str
     why_it_matters: str
     target_audience: str
     decision: str  # "keep" or "drop"
 
+    @classmethod
+    def from_raw(cls, d: dict) -> "GenaiNewsEval":
+        return cls(
+            relevance_score=_score_0_100(d["relevance_score"]),
+            topic=str(d.get("topic", "")),
+            why_it_matters=str(d.get("why_it_matters", "")),
+            target_audience=str(d.get("target_audience", "")),
+            decision=str(d["decision"]),
+        )
+
+    def model_dump(self) -> dict:
+        return asdict(self)
 
-class ProductIdeasEval(BaseModel):
+
+@dataclass(slots=True)
+class ProductIdeasEval:
     idea_type: str
     problem_statement: str
     solution_summary: str
     maturity_level: str
-    reusability_score: int = Field(ge=0, le=100)
+    reusability_score: int
     decision: str  # "keep" or "drop"
 
+    @classmethod
+    def from_raw(cls, d: dict) -> "ProductIdeasEval":
+        return cls(
+            idea_type=str(d.get("idea_type", "")),
+            problem_statement=str(d.get("problem_statement", "")),
+            solution_summary=str(d.get("solution_summary", "")),
+            maturity_level=str(d.get("maturity_level", "")),
+            reusability_score=_score_0_100(d["reusability_score"]),
+            decision=str(d["decision"]),
+        )
+
+    def model_dump(self) -> dict:
+        return asdict(self)
+
 
 GENAI_SYSTEM = """You are an evaluator for a daily GenAI/AI engineering news digest.
 Return ONLY valid JSON matching this schema:
@@ -48,25 +84,36 @@ Be strict: keep only strong, actionable ideas.
 """
 
 
-def _item_to_prompt(item: Item) -> str:
-    return f"""Evaluate this item:
+_PROMPT_TMPL = """Evaluate this item:
 
-TITLE: {item.title}
-URL: {item.url}
-SOURCE: {item.source}
-TEXT: {(item.text or "")[:1200]}
-METADATA: {item.metadata_json}
+TITLE: {title}
+URL: {url}
+SOURCE: {source}
+TEXT: {text}
+METADATA: {md}
 """
 
 
+def _item_to_prompt(item: Item) -> str:
+    return _PROMPT_TMPL.format_map(
+        {
+            "title": item.title,
+            "url": item.url,
+            "source": item.source,
+            "text": (item.text or "")[:1200],
+            "md": item.metadata_json,
+        }
+    )
+
+
 class Evaluator:
     def __init__(self) -> None:
         self.ollama = OllamaClient()
 
     def eval_genai_news(self, item: Item) -> GenaiNewsEval:
         raw = self.ollama.chat_json(GENAI_SYSTEM, _item_to_prompt(item))
-        return GenaiNewsEval.model_validate(raw)
+        return GenaiNewsEval.from_raw(raw)
 
     def eval_product_ideas(self, item: Item) -> ProductIdeasEval:
         raw = self.ollama.chat_json(PRODUCT_SYSTEM, _item_to_prompt(item))
-        return ProductIdeasEval.model_validate(raw)
+        return ProductIdeasEval.from_raw(raw)
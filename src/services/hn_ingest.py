@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Iterable
+from requests.adapters import HTTPAdapter
 
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
 from src.db.database import get_engine
@@ -14,15 +15,22 @@ from src.db.models import Item
 HN_TOP_STORIES = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_ITEM = "https://hacker-news.firebaseio.com/v0/item/{id}.json"
 
+# One pooled session for all HN calls: keep-alive avoids a TLS handshake
+# per story, and the pool lets the thread pool keep connections in flight.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+_FETCH_WORKERS = 16
+
 
 def fetch_top_story_ids(limit: int = 50) -> list[int]:
-    r = requests.get(HN_TOP_STORIES, timeout=20)
+    r = _session.get(HN_TOP_STORIES, timeout=20)
     r.raise_for_status()
     return r.json()[:limit]
 
 
 def fetch_story(story_id: int) -> dict | None:
-    r = requests.get(HN_ITEM.format(id=story_id), timeout=20)
+    r = _session.get(HN_ITEM.format(id=story_id), timeout=20)
     r.raise_for_status()
     data = r.json()
 
@@ -37,40 +45,46 @@ def fetch_story(story_id: int) -> dict | None:
 
 def ingest_hackernews(limit: int = 30) -> int:
     engine = get_engine()
-    inserted = 0
 
     ids = fetch_top_story_ids(limit)
 
+    # Fetch stories in parallel; wall time is ~RTT * limit / workers
+    # instead of sequential RTT + sleep per story.
+    fetched: list[dict] = []
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as pool:
+        futures = [pool.submit(fetch_story, sid) for sid in ids]
+        for fut in as_completed(futures):
+            data = fut.result()
+            if data:
+                fetched.append(data)
+
+    rows = [
+        {
+            "source": "hackernews",
+            "url": data["url"],
+            "title": data.get("title", ""),
+            "text": data.get("text"),
+            "published_at": datetime.fromtimestamp(data["time"], tz=timezone.utc),
+            "score": data.get("score"),
+            "metadata_json": {
+                "hn_id": data["id"],
+                "score": data.get("score"),
+                "by": data.get("by"),
+                "descendants": data.get("descendants"),
+            },
+        }
+        for data in fetched
+    ]
+
+    if not rows:
+        return 0
+
+    # Single transaction: duplicates (URL is unique) are skipped by the
+    # database instead of exception-driven rollback per row.
     with Session(engine) as session:
-        for sid in ids:
-            data = fetch_story(sid)
-            if not data:
-                continue
-
-            item = Item(
-                source="hackernews",
-                url=data["url"],
-                title=data.get("title", ""),
-                text=data.get("text"),
-                published_at=datetime.fromtimestamp(
-                    data["time"], tz=timezone.utc
-                ),
-                metadata_json={
-                    "hn_id": data["id"],
-                    "score": data.get("score"),
-                    "by": data.get("by"),
-                    "descendants": data.get("descendants"),
-                },
-            )
-
-            # avoid duplicates (URL is unique)
-            session.add(item)
-            try:
-                session.commit()
-                inserted += 1
-            except Exception:
-                session.rollback()
-
-            time.sleep(0.2)  # be polite to HN
+        stmt = insert(Item).values(rows).on_conflict_do_nothing(index_elements=["url"])
+        result = session.execute(stmt)
+        session.commit()
+        inserted = result.rowcount
 
     return inserted
@@ -1,71 +1,142 @@
 from __future__ import annotations
 import requests
 from src.config.settings import get_settings
-import json
+import numpy as np
+import orjson
 import re
-import subprocess
 
 _JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
 
 
+def _find_json_block(text: str) -> str | None:
+    """
+    Single-pass balanced-brace scan for the first {...} block.
+    Cheaper than a greedy DOTALL regex over large outputs; respects
+    strings and escapes so braces inside values don't break the scan.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if escaped:
+            escaped = False
+            continue
+        if ch == "\\":
+            escaped = in_string
+            continue
+        if ch == '"':
+            in_string = not in_string
+            continue
+        if in_string:
+            continue
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
+
 class OllamaClient:
     """
-    CLI-based Ollama client (Windows-safe decoding).
+    HTTP-based Ollama client using a persistent session (keep-alive).
     """
 
     def __init__(self) -> None:
         s = get_settings()
         self.model = s.ollama_model
+        self.base_url = s.ollama_base_url.rstrip("/")
+        # snapshot hot attributes so per-call paths skip get_settings()
+        self._chat_url = f"{self.base_url}/api/chat"
+        self._embed_url = f"{self.base_url}/api/embeddings"
+        self._embed_model = s.ollama_embed_model
+        self._temperature = s.ollama_temperature
+        self._session = requests.Session()
 
     def _extract_json(self, text: str) -> dict:
         text = text.strip()
 
         # direct JSON
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
             pass
 
-        # find first {...}
-        m = _JSON_RE.search(text)
-        if not m:
-            raise ValueError(f"Model did not return JSON.\nRaw output:\n{text[:2000]}")
+        # find first balanced {...} without regex backtracking
+        block = _find_json_block(text)
+        if block is None:
+            # last resort: greedy regex (e.g. unbalanced braces in output)
+            m = _JSON_RE.search(text)
+            if not m:
+                raise ValueError(f"Model did not return JSON.\nRaw output:\n{text[:2000]}")
+            block = m.group(0)
 
-        block = m.group(0)
         try:
-            return json.loads(block)
-        except json.JSONDecodeError as e:
+            return orjson.loads(block)
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Couldn't parse JSON block:\n{block[:2000]}") from e
 
     def chat_json(self, system: str, user: str) -> dict:
         """
-        Runs ollama via CLI and parses JSON output.
-        Uses bytes capture + UTF-8 decode to avoid cp1252 decode crashes.
+        Calls the Ollama /api/chat endpoint with format=json and parses the reply.
+        One keep-alive connection for the whole process (no subprocess per call).
         """
-        # keep prompt minimal to reduce latency
-        prompt = f"{system}\n{user}\nReturn ONLY JSON."
-
-        proc = subprocess.run(
-            ["ollama", "run", self.model, prompt],
-            capture_output=True,   # bytes because text=False
-            text=False,
-            timeout=600,           # 10 minutes to survive first-load
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            "format": "json",
+            "stream": False,
+            "options": {"temperature": self._temperature},
+        }
+
+        r = self._session.post(
+            self._chat_url,
+            json=payload,
+            timeout=600,  # survive first model load
         )
+        r.raise_for_status()
 
-        stdout = proc.stdout.decode("utf-8", errors="replace") if proc.stdout else ""
-        stderr = proc.stderr.decode("utf-8", errors="replace") if proc.stderr else ""
+        content = orjson.loads(r.content)["message"]["content"]
 
-        if proc.returncode != 0:
-            raise RuntimeError(
-                f"ollama CLI failed (exit {proc.returncode}).\nSTDERR:\n{stderr[:2000]}\nSTDOUT:\n{stdout[:2000]}"
-            )
+        # format=json should give strict JSON; brace-scan extraction is fallback only
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return self._extract_json(content)
 
-        return self._extract_json(stdout)
+    def embed(self, text: str) -> np.ndarray:
+        payload = {"model": self._embed_model, "prompt": text}
+        r = self._session.post(self._embed_url, json=payload, timeout=120)
+        r.raise_for_status()
+        # orjson parses the large float array much faster than stdlib json
+        return np.asarray(orjson.loads(r.content)["embedding"], dtype="float32")
 
-    def embed(self, text: str) -> list[float]:
-        s = get_settings()
-        url = f"{s.ollama_base_url.rstrip('/')}/api/embeddings"
-        payload = {"model": s.ollama_embed_model, "prompt": text}
-        r = requests.post(url, json=payload, timeout=120)
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        """
+        Embed several texts in one request via the newer /api/embed
+        endpoint (array input). Falls back to per-text embed() on older
+        servers that don't know the endpoint.
+        """
+        if not texts:
+            return []
+
+        payload = {"model": self._embed_model, "input": texts}
+        r = self._session.post(
+            f"{self.base_url}/api/embed", json=payload, timeout=300
+        )
+        if r.status_code == 404:
+            return [self.embed(t) for t in texts]
         r.raise_for_status()
-        return r.json()["embedding"]
+        return [
+            np.asarray(v, dtype="float32")
+            for v in orjson.loads(r.content)["embeddings"]
+        ]
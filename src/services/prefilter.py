@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from typing import Iterable
+
 from src.db.models import Item
 from src.config.settings import get_settings
 
 
-def _contains_any(text: str, terms: list[str]) -> bool:
-    t = text.lower()
-    return any(term in t for term in terms)
+@lru_cache(maxsize=8)
+def _compile_terms(terms: tuple[str, ...]) -> re.Pattern | None:
+    """
+    One alternation pattern per term list: a single scan over the text
+    instead of one substring search per term.
+    """
+    if not terms:
+        return None
+    return re.compile("|".join(map(re.escape, terms)))
 
 
 def prefilter_items(items: Iterable[Item]) -> list[Item]:
@@ -17,31 +26,30 @@ def prefilter_items(items: Iterable[Item]) -> list[Item]:
     s = get_settings()
     kept: list[Item] = []
 
+    block_re = _compile_terms(tuple(s.hn_blocklist))
+    keyword_re = _compile_terms(tuple(s.hn_keywords))
+
     for it in items:
         title = (it.title or "").strip()
         if not title:
             continue
 
+        title_l = title.lower()
+
         # blocklist check (title)
-        if s.hn_blocklist and _contains_any(title, s.hn_blocklist):
+        if block_re and block_re.search(title_l):
             continue
 
-        # engagement threshold (HN score stored in metadata_json)
-        score = None
-        try:
-            score = it.metadata_json.get("score")
-        except Exception:
-            score = None
-
-        if isinstance(score, int) and score < s.hn_min_score:
+        # engagement threshold (typed Item.score column, no JSON decode)
+        if it.score is not None and it.score < s.hn_min_score:
             continue
 
         # keyword requirement (optional)
-        if s.hn_require_keywords and s.hn_keywords:
-            hay = title
+        if s.hn_require_keywords and keyword_re:
+            hay = title_l
             if it.text:
-                hay += " " + it.text
-            if not _contains_any(hay, s.hn_keywords):
+                hay += " " + it.text.lower()
+            if not keyword_re.search(hay):
                 continue
 
         kept.append(it)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import io
 import json
 import re
 from datetime import datetime
@@ -8,34 +10,58 @@ from typing import Any
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
 from src.config.settings import get_settings
 
 
+def _load_digest_json(path: str) -> dict:
+    # orjson parses straight from bytes (no UTF-8 decode to str first)
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 # ---------------------------
 # MarkdownV2 escaping helpers
 # ---------------------------
 
+# single-pass C-level char map; cheaper than re.sub for the 18-char
+# MarkdownV2 escape set, and this is the hottest function in the file
+_MDV2_TRANS = str.maketrans({c: "\\" + c for c in r"_*[]()~`>#+-=|{}.!"})
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+
 def mdv2_escape(text: str) -> str:
     if text is None:
         return ""
     # Escape Telegram MarkdownV2 special chars
-    return re.sub(r"([_\*\[\]\(\)~`>#+\-=|{}\.!])", r"\\\1", str(text))
+    return (text if isinstance(text, str) else str(text)).translate(_MDV2_TRANS)
 
 
-def fmt_link(title: str, url: str) -> str:
+@functools.lru_cache(maxsize=512)
+def _fmt_link_cached(title: str, url: str) -> str:
     safe_title = mdv2_escape(title)
     # Encode URL characters that break MarkdownV2 parsing.
     # Keep : / ? & = # % . - _ ~ safe, encode everything else.
-    safe_url = quote(str(url), safe=":/?&=#+%.-_~")
+    safe_url = quote(url, safe=":/?&=#+%.-_~")
     return f"[{safe_title}]({safe_url})"
 
 
-def compact_int(x: Any) -> str:
-    try:
-        n = int(x)
-    except Exception:
-        return ""
+def fmt_link(title: str, url: str) -> str:
+    # pure function, and the same items recur across top picks, topic
+    # buckets and combined digests — memoize the escaped result
+    return _fmt_link_cached(str(title), str(url))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compact_int_cached(n: int) -> str:
     if n >= 1_000_000:
         return f"{n/1_000_000:.1f}M"
     if n >= 1_000:
@@ -43,17 +69,56 @@ def compact_int(x: Any) -> str:
     return str(n)
 
 
+def compact_int(x: Any) -> str:
+    # the same point/comment counts recur across items and days
+    try:
+        n = int(x)
+    except Exception:
+        return ""
+    return _compact_int_cached(n)
+
+
+def _truncate(s: str, n: int) -> str:
+    # single-char ellipsis: fewer bytes per message than "..."
+    s = s.strip()
+    return s if len(s) <= n else s[:n - 1] + "…"
+
+
 # ---------------------------
 # Tags
 # ---------------------------
 
 def _slug_tag(s: str) -> str:
-    s = re.sub(r"[^a-zA-Z0-9]+", "_", (s or "").strip().lower()).strip("_")
+    s = _SLUG_RE.sub("_", (s or "").strip().lower()).strip("_")
     if not s:
         return ""
     return f"#{s[:24]}"
 
 
+# one alternation scan over the title instead of one substring search
+# per keyword; matches map to canonical tag names
+_KW_RE = re.compile(
+    r"(fine-?tune|rag|agents?|llm|inference|embedding|vector|eval"
+    r"|openai|anthropic|gemma|llama)"
+)
+_KW_MAP = {
+    "rag": "rag",
+    "agent": "agents",
+    "agents": "agents",
+    "llm": "llm",
+    "inference": "inference",
+    "embedding": "embeddings",
+    "vector": "vector_db",
+    "eval": "evals",
+    "finetune": "finetuning",
+    "fine-tune": "finetuning",
+    "openai": "openai",
+    "anthropic": "anthropic",
+    "gemma": "gemma",
+    "llama": "llama",
+}
+
+
 def build_tags(title: str, ev: dict, persona: str) -> list[str]:
     tags: list[str] = []
 
@@ -68,44 +133,41 @@ def build_tags(title: str, ev: dict, persona: str) -> list[str]:
             tags.append(_slug_tag(idea_type))
 
     title_l = (title or "").lower()
-    common = [
-        ("rag", "rag"),
-        ("agent", "agents"),
-        ("agents", "agents"),
-        ("llm", "llm"),
-        ("inference", "inference"),
-        ("embedding", "embeddings"),
-        ("vector", "vector_db"),
-        ("eval", "evals"),
-        ("finetune", "finetuning"),
-        ("fine-tune", "finetuning"),
-        ("openai", "openai"),
-        ("anthropic", "anthropic"),
-        ("gemma", "gemma"),
-        ("llama", "llama"),
-    ]
-    for needle, tag in common:
-        if needle in title_l:
-            tags.append(_slug_tag(tag))
-
-    uniq: list[str] = []
-    for t in tags:
-        if t and t not in uniq:
-            uniq.append(t)
-    return uniq[:5]
+    for m in _KW_RE.findall(title_l):
+        tags.append(_slug_tag(_KW_MAP[m]))
+
+    # insertion-ordered dedup in one C-level pass
+    return [t for t in dict.fromkeys(tags) if t][:5]
 
 
 # ---------------------------
 # Rendering per persona
 # ---------------------------
 
+def _points(md: dict):
+    return md.get("score") or md.get("points")
+
+
+def _comments(md: dict):
+    return md.get("comments") or md.get("descendants")
+
+
+def _badge(points, comments) -> str:
+    # returns already-escaped text ("" when there is nothing to show)
+    parts = []
+    if points is not None:
+        parts.append(f"⬆️ {compact_int(points)}")
+    if comments is not None:
+        parts.append(f"💬 {compact_int(comments)}")
+    return "  •  ".join(parts).translate(_MDV2_TRANS)
+
+
 def _render_genai_news(items: list[dict], max_items: int) -> str:
     # Sort by eval score desc then HN points desc
     def key_fn(it: dict):
         score = it.get("score") or 0
         md = it.get("metadata", {}) or {}
-        points = md.get("score") or md.get("points") or 0
-        return (score, points)
+        return (score, _points(md) or 0)
 
     items_sorted = sorted(items, key=key_fn, reverse=True)
 
@@ -113,56 +175,56 @@ def _render_genai_news(items: list[dict], max_items: int) -> str:
     top = items_sorted[: min(3, max_items)]
     rest = items_sorted[min(3, max_items):]
 
-    lines: list[str] = []
-    lines.append("🧠 *GENAI NEWS*")
-    lines.append("_Top technical updates worth your time_")
-    lines.append("")
-
-    if top:
-        lines.append("🔥 *Top picks*")
-        for it in top:
-            title = it.get("title", "Untitled")
-            url = it.get("url", "")
-            ev = it.get("evaluation", {}) or {}
-            md = it.get("metadata", {}) or {}
+    buf = io.StringIO()
 
-            why = ev.get("why_it_matters", "")
-            topic = ev.get("topic", "")
-            audience = ev.get("target_audience", "")
+    def _line(s: str) -> None:
+        buf.write(s)
+        buf.write("\n")
 
-            points = md.get("score") or md.get("points")
-            comments = md.get("comments") or md.get("descendants")
+    def _emit_item(it: dict, why_max: int, with_topic: bool) -> None:
+        # one shared emitter for top picks and topic buckets; they only
+        # differ in truncation length and the inline topic suffix
+        title = it.get("title", "Untitled")
+        url = it.get("url", "")
+        ev = it.get("evaluation", {}) or {}
+        md = it.get("metadata", {}) or {}
 
-            tags = build_tags(title, ev, "GENAI_NEWS")
+        g = ev.get  # bind once; .get is hit several times per item
+        why = g("why_it_matters", "")
+        audience = g("target_audience", "")
+        tags = build_tags(title, ev, "GENAI_NEWS")
 
-            badge_parts = []
-            if points is not None:
-                badge_parts.append(f"⬆️ {compact_int(points)}")
-            if comments is not None:
-                badge_parts.append(f"💬 {compact_int(comments)}")
-            badge = "  •  ".join(badge_parts)
+        badge = _badge(_points(md), _comments(md))
 
-            line = f"• {fmt_link(title, url)}"
+        line = f"• {fmt_link(title, url)}"
+        if with_topic:
+            topic = g("topic", "")
             if topic:
                 line += f" — _{mdv2_escape(topic)}_"
-            lines.append(line)
+        _line(line)
+
+        if badge:
+            _line(badge)
+
+        if why:
+            _line(f"  {mdv2_escape(_truncate(str(why), why_max))}")
 
-            if badge:
-                lines.append(mdv2_escape(badge))
+        if audience:
+            _line(f"  *For:* {mdv2_escape(audience)}")
 
-            if why:
-                w = str(why).strip()
-                if len(w) > 160:
-                    w = w[:157] + "..."
-                lines.append(f"  {mdv2_escape(w)}")
+        if tags:
+            _line(f"  *Tags:* {mdv2_escape(' '.join(tags))}")
 
-            if audience:
-                lines.append(f"  *For:* {mdv2_escape(audience)}")
+    _line("🧠 *GENAI NEWS*")
+    _line("_Top technical updates worth your time_")
+    _line("")
 
-            if tags:
-                lines.append(f"  *Tags:* {mdv2_escape(' '.join(tags))}")
+    if top:
+        _line("🔥 *Top picks*")
+        for it in top:
+            _emit_item(it, why_max=160, with_topic=True)
 
-        lines.append("")
+        _line("")
 
     # Group remaining by topic
     buckets: dict[str, list[dict]] = {}
@@ -178,52 +240,18 @@ def _render_genai_news(items: list[dict], max_items: int) -> str:
         if shown >= remaining_budget:
             break
 
-        lines.append(f"📌 *{mdv2_escape(topic)}*")
+        _line(f"📌 *{mdv2_escape(topic)}*")
 
         for it in group:
             if shown >= remaining_budget:
                 break
 
-            title = it.get("title", "Untitled")
-            url = it.get("url", "")
-            ev = it.get("evaluation", {}) or {}
-            md = it.get("metadata", {}) or {}
-
-            why = ev.get("why_it_matters", "")
-            audience = ev.get("target_audience", "")
-            tags = build_tags(title, ev, "GENAI_NEWS")
-
-            points = md.get("score") or md.get("points")
-            comments = md.get("comments") or md.get("descendants")
-
-            badge_parts = []
-            if points is not None:
-                badge_parts.append(f"⬆️ {compact_int(points)}")
-            if comments is not None:
-                badge_parts.append(f"💬 {compact_int(comments)}")
-            badge = "  •  ".join(badge_parts)
-
-            lines.append(f"• {fmt_link(title, url)}")
-            if badge:
-                lines.append(mdv2_escape(badge))
-
-            if why:
-                w = str(why).strip()
-                if len(w) > 140:
-                    w = w[:137] + "..."
-                lines.append(f"  {mdv2_escape(w)}")
-
-            if audience:
-                lines.append(f"  *For:* {mdv2_escape(audience)}")
-
-            if tags:
-                lines.append(f"  *Tags:* {mdv2_escape(' '.join(tags))}")
-
+            _emit_item(it, why_max=140, with_topic=False)
             shown += 1
 
-        lines.append("")
+        _line("")
 
-    return "\n".join(lines).strip()
+    return buf.getvalue().strip()
 
 
 def _render_product_ideas(items: list[dict], max_items: int) -> str:
@@ -233,10 +261,15 @@ def _render_product_ideas(items: list[dict], max_items: int) -> str:
 
     items = sorted(items, key=key_fn, reverse=True)[:max_items]
 
-    lines: list[str] = []
-    lines.append("💡 *PRODUCT IDEAS*")
-    lines.append("_Signals, patterns, and launchable opportunities_")
-    lines.append("")
+    buf = io.StringIO()
+
+    def _line(s: str) -> None:
+        buf.write(s)
+        buf.write("\n")
+
+    _line("💡 *PRODUCT IDEAS*")
+    _line("_Signals, patterns, and launchable opportunities_")
+    _line("")
 
     for i, it in enumerate(items, start=1):
         title = it.get("title", "Idea")
@@ -244,13 +277,14 @@ def _render_product_ideas(items: list[dict], max_items: int) -> str:
         ev = it.get("evaluation", {}) or {}
         md = it.get("metadata", {}) or {}
 
-        idea_type = ev.get("idea_type", "")
-        problem = ev.get("problem_statement", "")
-        solution = ev.get("solution_summary", "")
-        maturity = ev.get("maturity_level", "")
+        g = ev.get
+        idea_type = g("idea_type", "")
+        problem = g("problem_statement", "")
+        solution = g("solution_summary", "")
+        maturity = g("maturity_level", "")
 
         # ✅ "Why" for product ideas (derive if missing)
-        why = ev.get("why_it_matters") or ev.get("value") or ""
+        why = g("why_it_matters") or g("value") or ""
         if not why:
             if problem and solution:
                 why = f"{problem} → {solution}"
@@ -261,51 +295,37 @@ def _render_product_ideas(items: list[dict], max_items: int) -> str:
 
         tags = build_tags(title, ev, "PRODUCT_IDEAS")
 
-        points = md.get("score") or md.get("points")
-        comments = md.get("comments") or md.get("descendants")
+        points = _points(md)
+        comments = _comments(md)
 
-        badge_parts = []
-        if points is not None:
-            badge_parts.append(f"⬆️ {compact_int(points)}")
-        if comments is not None:
-            badge_parts.append(f"💬 {compact_int(comments)}")
-        badge = "  •  ".join(badge_parts)
+        badge = _badge(points, comments)
 
         # ✅ escape dot in MarkdownV2
-        lines.append(f"*{i}\\.* {fmt_link(title, url)}")
+        _line(f"*{i}\\.* {fmt_link(title, url)}")
         if badge:
-            lines.append(mdv2_escape(badge))
+            _line(badge)
 
         if idea_type:
-            lines.append(f"• *Type:* {mdv2_escape(idea_type)}")
+            _line(f"• *Type:* {mdv2_escape(idea_type)}")
 
         if why:
-            w = str(why).strip()
-            if len(w) > 180:
-                w = w[:177] + "..."
-            lines.append(f"• *Why:* {mdv2_escape(w)}")
+            _line(f"• *Why:* {mdv2_escape(_truncate(str(why), 180))}")
 
         if problem:
-            p = str(problem).strip()
-            if len(p) > 180:
-                p = p[:177] + "..."
-            lines.append(f"• *Problem:* {mdv2_escape(p)}")
+            _line(f"• *Problem:* {mdv2_escape(_truncate(str(problem), 180))}")
 
         if solution:
-            sol = str(solution).strip()
-            if len(sol) > 220:
-                sol = sol[:217] + "..."
-            lines.append(f"• *Solution:* {mdv2_escape(sol)}")
+            _line(f"• *Solution:* {mdv2_escape(_truncate(str(solution), 220))}")
 
         if maturity:
-            lines.append(f"• *Maturity:* {mdv2_escape(maturity)}")
+            _line(f"• *Maturity:* {mdv2_escape(maturity)}")
 
         if tags:
-            lines.append(f"• *Tags:* {mdv2_escape(' '.join(tags))}")
+            _line(f"• *Tags:* {mdv2_escape(' '.join(tags))}")
 
-        lines.append("")
+        _line("")
 
-    return "\n".join(lines).strip()
+    return buf.getvalue().strip()
 
 
 # ---------------------------
@@ -314,7 +334,7 @@ def _render_product_ideas(items: list[dict], max_items: int) -> str:
 
 def build_telegram_text_from_digest_json(json_path: str) -> str:
     s = get_settings()
-    data = json.loads(Path(json_path).read_text(encoding="utf-8"))
+    data = _load_digest_json(json_path)
 
     persona = data.get("persona", "DIGEST")
     date = data.get("date", datetime.now().strftime("%Y-%m-%d"))
@@ -341,10 +361,7 @@ def build_telegram_text_from_digest_json(json_path: str) -> str:
 def build_combined_telegram_text(json_paths: list[str]) -> str:
     s = get_settings()
 
-    digests = []
-    for p in json_paths:
-        data = json.loads(Path(p).read_text(encoding="utf-8"))
-        digests.append(data)
+    digests = [_load_digest_json(p) for p in json_paths]
 
     date = digests[0].get("date", datetime.now().strftime("%Y-%m-%d"))
 
@@ -355,11 +372,13 @@ def build_combined_telegram_text(json_paths: list[str]) -> str:
 
     footer = mdv2_escape("Built locally • No external AI APIs • Have a good day ✨")
 
+    # loop-invariant; get_settings() itself is an lru_cache hit by now
+    max_items = getattr(s, "telegram_max_items", 6)
+
     parts = []
     for d in digests:
         persona = d.get("persona", "DIGEST")
         items = d.get("items", []) or []
-        max_items = getattr(s, "telegram_max_items", 6)
 
         if persona == "GENAI_NEWS":
             parts.append(_render_genai_news(items, max_items=max_items))
@@ -378,6 +397,11 @@ def build_combined_telegram_text(json_paths: list[str]) -> str:
 # Sender
 # ---------------------------
 
+# keep-alive to api.telegram.org: multi-chunk sends pay one TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+
 def _chunk_telegram_message(text: str, limit: int = 3900) -> list[str]:
     """
     Telegram sendMessage limit is 4096 chars.
@@ -389,70 +413,26 @@ def _chunk_telegram_message(text: str, limit: int = 3900) -> list[str]:
     if len(text) <= limit:
         return [text]
 
-    # First: split by double newlines (best boundary between sections/items)
-    blocks = text.split("\n\n")
-
+    # Single walk over the text: prefer cutting at a paragraph boundary,
+    # then a line boundary, else hard-cut at the limit. No intermediate
+    # block lists or rejoin copies.
     chunks: list[str] = []
-    buf: list[str] = []
-    size = 0
-
-    def flush():
-        nonlocal buf, size
-        if buf:
-            chunks.append("\n\n".join(buf).strip())
-            buf = []
-            size = 0
-
-    for b in blocks:
-        b = b.strip()
-        if not b:
-            continue
-        add_len = len(b) + (2 if buf else 0)  # account for "\n\n"
-        if size + add_len <= limit:
-            buf.append(b)
-            size += add_len
-        else:
-            # if a single block is too large, split it further by lines
-            flush()
-            if len(b) <= limit:
-                buf.append(b)
-                size = len(b)
-            else:
-                lines = b.split("\n")
-                line_buf: list[str] = []
-                line_size = 0
-
-                def flush_lines():
-                    nonlocal line_buf, line_size
-                    if line_buf:
-                        chunks.append("\n".join(line_buf).strip())
-                        line_buf = []
-                        line_size = 0
-
-                for ln in lines:
-                    ln = ln.rstrip()
-                    if not ln:
-                        continue
-                    ln_add = len(ln) + (1 if line_buf else 0)  # account for "\n"
-                    if line_size + ln_add <= limit:
-                        line_buf.append(ln)
-                        line_size += ln_add
-                    else:
-                        flush_lines()
-                        if len(ln) <= limit:
-                            line_buf.append(ln)
-                            line_size = len(ln)
-                        else:
-                            # last resort: hard split
-                            for i in range(0, len(ln), limit):
-                                chunks.append(ln[i:i+limit])
-
-                flush_lines()
-
-    flush()
-
-    # remove empties
-    return [c for c in chunks if c.strip()]
+    pos = 0
+    n = len(text)
+    while pos < n:
+        end = pos + limit
+        if end < n:
+            cut = text.rfind("\n\n", pos, end)
+            if cut <= pos:
+                cut = text.rfind("\n", pos, end)
+            if cut > pos:
+                end = cut
+        chunk = text[pos:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        pos = end
+
+    return chunks
 
 
 def send_telegram_message(text: str) -> None:
@@ -469,7 +449,7 @@ def send_telegram_message(text: str) -> None:
     # ✅ Split long messages automatically
     chunks = _chunk_telegram_message(text, limit=3900)
 
-    for idx, chunk in enumerate(chunks, start=1):
+    def _post_chunk(chunk: str) -> None:
         payload = {
             "chat_id": chat_id,
             "text": chunk,
@@ -477,10 +457,17 @@ def send_telegram_message(text: str) -> None:
             "disable_web_page_preview": True,
         }
 
-        r = requests.post(url, json=payload, timeout=30)
+        r = _SESSION.post(url, json=payload, timeout=30)
         if not r.ok:
             try:
                 print("Telegram error:", r.json())
             except Exception:
                 print("Telegram error:", r.text)
             r.raise_for_status()
+
+    # Strictly sequential: Telegram orders messages by arrival, and the
+    # chunks are slices of one document, so chunk N+1 may only go out
+    # after chunk N's response. The keep-alive _SESSION already avoids
+    # per-chunk TCP/TLS setup, which is where the real latency was.
+    for chunk in chunks:
+        _post_chunk(chunk)
@@ -1,26 +1,36 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import Iterable
 
 import numpy as np
 
+from src.config.settings import get_settings
+
 INDEX_PATH = "data/faiss.index"
 META_PATH = "data/faiss_ids.npy"
 
 
-def _to_f32(vec: Iterable[float]) -> np.ndarray:
-    return np.asarray(list(vec), dtype="float32")
+@lru_cache(maxsize=1)
+def _faiss():
+    """
+    Import faiss once and let its distance kernels use all cores; batch
+    searches fan out across OpenMP threads.
+    """
+    import faiss
 
+    if hasattr(faiss, "omp_set_num_threads"):
+        faiss.omp_set_num_threads(os.cpu_count() or 1)
+    return faiss
 
-def _normalize_rows(X: np.ndarray) -> np.ndarray:
-    # cosine similarity => normalize vectors to unit length and use dot product
-    norms = np.linalg.norm(X, axis=1, keepdims=True) + 1e-12
-    return X / norms
+
+def _to_f32(vec: Iterable[float]) -> np.ndarray:
+    return np.asarray(list(vec), dtype="float32")
 
 
 def save_index(index, ids: np.ndarray) -> None:
-    import faiss
+    faiss = _faiss()
 
     os.makedirs("data", exist_ok=True)
     faiss.write_index(index, INDEX_PATH)
@@ -28,7 +38,7 @@ def save_index(index, ids: np.ndarray) -> None:
 
 
 def load_index():
-    import faiss
+    faiss = _faiss()
 
     if not os.path.exists(INDEX_PATH) or not os.path.exists(META_PATH):
         return None, None
@@ -37,42 +47,117 @@ def load_index():
     return index, ids
 
 
-def build_index(vectors: list[list[float]], ids: list[int]):
+def _make_index(faiss, dim: int, n: int):
+    """
+    Pick the index type from settings: exact IndexFlatIP by default,
+    HNSW (graph ANN, ~log N hops per query) for larger corpora,
+    sq8 (int8 scalar quantization, 4x smaller index, ~1% recall loss),
+    or ivfpq (inverted lists + product quantization: ~8x smaller codes
+    and only nprobe of nlist cells scanned per query).
+    """
+    index_type = get_settings().faiss_index_type.lower()
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 64
+        return index
+    if index_type == "sq8":
+        return faiss.IndexScalarQuantizer(
+            dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+    if index_type == "ivfpq":
+        # IVF/PQ k-means needs a real training set; small corpora fall
+        # back to exact search until they grow into it
+        if n < 1024:
+            return faiss.IndexFlatIP(dim)
+        nlist = min(1024, max(16, int(n**0.5)))
+        m = 32 if dim % 32 == 0 else 8  # PQ subquantizers must divide dim
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = 16
+        return index
+    return faiss.IndexFlatIP(dim)
+
+
+def build_index(vectors: list[list[float]] | np.ndarray, ids: list[int]):
     """
     Build an IndexFlatIP (inner product) over L2-normalized vectors => cosine similarity.
+    Accepts a ready (N, dim) float32 matrix to avoid per-row conversions.
     """
-    import faiss
+    faiss = _faiss()
 
-    if not vectors:
+    if len(vectors) == 0:
         return None, None
 
-    X = np.vstack([_to_f32(v) for v in vectors])
-    X = _normalize_rows(X)
+    # one allocation for both inputs: a ready matrix passes through,
+    # a list of equal-length rows is converted via NumPy's buffer fill
+    X = np.ascontiguousarray(np.asarray(vectors, dtype="float32"))
+    # cosine similarity => unit-length rows + inner product; in-place SIMD
+    faiss.normalize_L2(X)
     dim = X.shape[1]
 
-    index = faiss.IndexFlatIP(dim)
+    index = _make_index(faiss, dim, len(X))
+    if not index.is_trained:
+        index.train(X)  # sq8 learns its quantization ranges from the data
     index.add(X)
 
     ids_np = np.asarray(ids, dtype="int64")
     return index, ids_np
 
 
-def search(index, ids_np: np.ndarray, query_vec: list[float], k: int = 5) -> list[tuple[int, float]]:
+def add_to_index(index, ids_np: np.ndarray, vectors, new_ids: list[int]) -> np.ndarray:
     """
-    Returns list of (item_id, similarity) sorted by similarity desc.
-    Similarity is cosine similarity in [-1, 1] typically.
+    Append rows to an existing index without a rebuild (works for flat
+    and trained ANN indexes alike). Returns the extended ids array; the
+    caller persists both via save_index.
     """
+    faiss = _faiss()
+
+    X = np.ascontiguousarray(np.asarray(vectors, dtype="float32"))
+    faiss.normalize_L2(X)
+    index.add(X)
+    return np.concatenate([ids_np, np.asarray(new_ids, dtype="int64")])
+
+
+def search_batch(
+    index, ids_np: np.ndarray, queries: np.ndarray, k: int = 5
+) -> list[list[tuple[int, float]]]:
+    """
+    Search all query rows in one FAISS call (SIMD across the batch).
+    `queries` is a (B, dim) array; returns one hit list per query row,
+    each sorted by similarity desc.
+    """
+    faiss = _faiss()
+
     if index is None or ids_np is None:
+        return [[] for _ in range(len(queries))]
+    if len(queries) == 0:
         return []
 
-    q = _to_f32(query_vec).reshape(1, -1)
-    q = _normalize_rows(q)
+    Q = np.ascontiguousarray(queries, dtype="float32")
+    if Q.ndim == 1:
+        Q = Q.reshape(1, -1)
+    faiss.normalize_L2(Q)  # in place; Q is contiguous float32
+
+    scores, idxs = index.search(Q, k)
 
-    scores, idxs = index.search(q, k)
+    results: list[list[tuple[int, float]]] = []
+    for row_scores, row_idxs in zip(scores, idxs):
+        out: list[tuple[int, float]] = []
+        for score, i in zip(row_scores, row_idxs):
+            if i == -1:
+                continue
+            out.append((int(ids_np[i]), float(score)))
+        results.append(out)
+    return results
+
+
+def search(index, ids_np: np.ndarray, query_vec: list[float], k: int = 5) -> list[tuple[int, float]]:
+    """
+    Single-query convenience wrapper around search_batch.
+    Similarity is cosine similarity in [-1, 1] typically.
+    """
+    if index is None or ids_np is None:
+        return []
 
-    out: list[tuple[int, float]] = []
-    for score, i in zip(scores[0], idxs[0]):
-        if i == -1:
-            continue
-        out.append((int(ids_np[i]), float(score)))
-    return out
+    results = search_batch(index, ids_np, _to_f32(query_vec).reshape(1, -1), k=k)
+    return results[0] if results else []
@@ -2,27 +2,51 @@ from __future__ import annotations
 
 from pathlib import Path
 import os
-import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 LOCK_PATH = Path("data/run.lock")
 
 
 class RunLock:
+    """
+    Advisory file lock around a digest run. The kernel releases the lock
+    when the process exits, so crashed runs never leave a stale lock and
+    two processes can't both think the lock file is absent.
+    """
+
     def __init__(self, timeout_seconds: int = 60 * 60):
+        # kept for call compatibility; the OS lock makes staleness moot
         self.timeout_seconds = timeout_seconds
+        self._fh = None
 
     def __enter__(self):
         LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-        if LOCK_PATH.exists():
-            age = time.time() - LOCK_PATH.stat().st_mtime
-            if age < self.timeout_seconds:
-                raise RuntimeError("Another run is already in progress (lock exists).")
-            # stale lock
-            LOCK_PATH.unlink(missing_ok=True)
-
-        LOCK_PATH.write_text(str(os.getpid()), encoding="utf-8")
+        self._fh = open(LOCK_PATH, "w", encoding="utf-8")
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            self._fh.close()
+            self._fh = None
+            raise RuntimeError("Another run is already in progress (lock held).")
+
+        self._fh.write(str(os.getpid()))
+        self._fh.flush()
         return self
 
     def __exit__(self, exc_type, exc, tb):
-        LOCK_PATH.unlink(missing_ok=True)
+        if self._fh is not None:
+            if fcntl is None:
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            self._fh.close()
+            self._fh = None
+        # the lock file itself is left in place; the lock lives on the fd
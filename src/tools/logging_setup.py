@@ -1,21 +1,43 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from src.config.settings import get_settings
 
+_listener: QueueListener | None = None
+
 
 def setup_logging() -> None:
+    global _listener
+    if _listener is not None:
+        return
+
     s = get_settings()
     log_path = getattr(s, "log_file", "logs/run.log")
 
     Path(log_path).parent.mkdir(parents=True, exist_ok=True)
 
-    logging.basicConfig(
-        level=getattr(logging, s.log_level.upper(), logging.INFO),
-        format="%(asctime)s | %(levelname)s | %(message)s",
-        handlers=[
-            logging.FileHandler(log_path, encoding="utf-8"),
-            logging.StreamHandler(),
-        ],
+    # Callers only enqueue records; a background listener does the
+    # file/stream I/O, so logging never blocks the pipeline.
+    log_queue: queue.Queue = queue.Queue(-1)
+
+    # raw created float instead of asctime (skips strftime per record),
+    # one-char level; delay=True defers opening the file to first write
+    formatter = logging.Formatter("%(created).3f | %(levelname).1s | %(message)s")
+    file_handler = logging.FileHandler(log_path, encoding="utf-8", delay=True)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    _listener = QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
     )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, s.log_level.upper(), logging.INFO))
+    root.handlers = [QueueHandler(log_queue)]
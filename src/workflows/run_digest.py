@@ -1,4 +1,9 @@
-from sqlalchemy.orm import Session
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, load_only, selectinload, undefer
 
 from src.config.settings import get_settings
 from src.db.database import get_engine
@@ -12,7 +17,15 @@ from src.services.telegram_delivery import (
     build_telegram_text_from_digest_json,
     send_telegram_message,
 )
-from src.services.dedup import ensure_item_embedding, rebuild_faiss_index_from_db, is_semantic_duplicate
+from src.services.dedup import ensure_item_embeddings, rebuild_faiss_index_from_db, find_semantic_duplicates
+
+
+def _deliver_telegram(json_paths: list[str]) -> None:
+    try:
+        msg = build_combined_telegram_text(json_paths)
+        send_telegram_message(msg)
+    except Exception as e:
+        print(f"Telegram delivery failed: {e}")
 
 
 def run_digest() -> dict:
@@ -21,97 +34,137 @@ def run_digest() -> dict:
 
     engine = get_engine()
 
-    # 1) Read recent items
+    # One session spans read -> dedup -> eval: the items stay attached
+    # throughout (no detach/re-attach churn, no repeated pool checkouts)
+    # and everything lands in a single commit at the end.
     with Session(engine) as session:
+        # 1) Read recent items (score threshold pushed down to SQL;
+        #    NULL scores pass through for non-HN/legacy rows)
+        #    load_only defers the wide columns (metadata_json,
+        #    published_at) that prefilter/dedup never touch
         items = (
             session.query(Item)
+            .options(
+                load_only(
+                    Item.source,
+                    Item.title,
+                    Item.url,
+                    Item.text,
+                    Item.score,
+                    Item.created_at,
+                ),
+                selectinload(Item.embeddings),
+            )
+            .filter(or_(Item.score.is_(None), Item.score >= s.hn_min_score))
             .order_by(Item.created_at.desc())
             .limit(100)
             .all()
         )
 
-    # 2) Prefilter (cheap)
-    prefiltered = prefilter_items(items)
-    candidates = prefiltered[: s.eval_max_items]
+        # 2) Prefilter (cheap)
+        prefiltered = prefilter_items(items)
+        candidates = prefiltered[: s.eval_max_items]
 
-    # 2b) Semantic dedup (embeddings + FAISS)
-    with Session(engine) as session:
-        for it in candidates:
-            ensure_item_embedding(session, it)
-        session.commit()
+        # 2b) Semantic dedup (embeddings + FAISS); the eager-loaded
+        # relationship tells us which items already have vectors, and the
+        # missing ones go to the model as one batch request + bulk insert
+        ensure_item_embeddings(session, [it for it in candidates if not it.embeddings])
         rebuild_faiss_index_from_db(session)
 
-    deduped = []
-    with Session(engine) as session:
+        # one FAISS search over the whole candidate batch
+        dups = find_semantic_duplicates(session, candidates)
+        deduped = []
         for it in candidates:
-            dup, near_id, sim = is_semantic_duplicate(session, it)
-            if dup:
+            if it.id in dups:
+                near_id, sim = dups[it.id]
                 print(f"Dedup drop: item {it.id} ~ {near_id} (sim={sim:.2f})")
                 continue
             deduped.append(it)
 
-    filtered = deduped
-
-    # 3) Evaluate and store
-    evaluator = Evaluator()
-    created_evals = 0
-
-    with Session(engine) as session:
-        for it in filtered:
-
-            if "GENAI_NEWS" in s.personas_enabled:
-                exists = (
-                    session.query(Evaluation)
-                    .filter_by(item_id=it.id, persona="GENAI_NEWS")
-                    .first()
+        filtered = deduped
+
+        # 3) Evaluate and store. Rows are collected per persona and
+        # written with one conflict-safe bulk INSERT each; the unique
+        # (item_id, persona) index makes re-runs a no-op instead of a
+        # per-item existence SELECT.
+        # Hydrate the deferred metadata_json for just the items that
+        # survived to evaluation (one IN query, on this thread — worker
+        # threads must never trigger lazy loads on a shared session).
+        if filtered:
+            session.query(Item).options(undefer(Item.metadata_json)).filter(
+                Item.id.in_([it.id for it in filtered])
+            ).all()
+
+        evaluator = Evaluator()
+
+        # (persona, eval call, name of its headline score field)
+        persona_evals = []
+        if "GENAI_NEWS" in s.personas_enabled:
+            persona_evals.append(("GENAI_NEWS", evaluator.eval_genai_news, "relevance_score"))
+        if "PRODUCT_IDEAS" in s.personas_enabled:
+            persona_evals.append(("PRODUCT_IDEAS", evaluator.eval_product_ideas, "reusability_score"))
+
+        # Already-evaluated (item_id, persona) pairs, fetched in one
+        # query; skipping them here saves the LLM call, not just the
+        # INSERT (the unique index would swallow the row anyway).
+        existing = {
+            tuple(row)
+            for row in session.execute(
+                select(Evaluation.item_id, Evaluation.persona).where(
+                    Evaluation.item_id.in_([it.id for it in filtered]),
+                    Evaluation.persona.in_(s.personas_enabled),
                 )
-                if not exists:
-                    ev = evaluator.eval_genai_news(it)
-                    session.add(
-                        Evaluation(
-                            item_id=it.id,
-                            persona="GENAI_NEWS",
-                            decision=ev.decision,
-                            score=ev.relevance_score,
-                            payload_json=ev.model_dump(),
-                        )
-                    )
-                    created_evals += 1
-
-            if "PRODUCT_IDEAS" in s.personas_enabled:
-                exists = (
-                    session.query(Evaluation)
-                    .filter_by(item_id=it.id, persona="PRODUCT_IDEAS")
-                    .first()
+            )
+        }
+
+        # Each eval is a blocking LLM round-trip, so fan them out across
+        # a small pool; max_workers doubles as the Ollama rate limit.
+        eval_rows: list[dict] = []
+        with ThreadPoolExecutor(max_workers=s.eval_concurrency) as ex:
+            futures = [
+                (it.id, persona, score_field, ex.submit(call, it))
+                for it in filtered
+                for persona, call, score_field in persona_evals
+                if (it.id, persona) not in existing
+            ]
+            for item_id, persona, score_field, fut in futures:
+                ev = fut.result()
+                eval_rows.append(
+                    {
+                        "item_id": item_id,
+                        "persona": persona,
+                        "decision": ev.decision,
+                        "score": getattr(ev, score_field),
+                        "payload_json": ev.model_dump(),
+                    }
                 )
-                if not exists:
-                    ev = evaluator.eval_product_ideas(it)
-                    session.add(
-                        Evaluation(
-                            item_id=it.id,
-                            persona="PRODUCT_IDEAS",
-                            decision=ev.decision,
-                            score=ev.reusability_score,
-                            payload_json=ev.model_dump(),
-                        )
-                    )
-                    created_evals += 1
-
-        session.commit()
-
-    # 4) Build digests
-    digests = [build_digest_for_persona(p) for p in s.personas_enabled]
 
-    # 5) Telegram delivery
-    
-
-    try:
-        msg = build_combined_telegram_text([d["json_path"] for d in digests])
-        send_telegram_message(msg)
-    except Exception as e:
-        print(f"Telegram delivery failed: {e}")
+        created_evals = len(eval_rows)
+        if eval_rows:
+            session.execute(
+                insert(Evaluation)
+                .values(eval_rows)
+                .on_conflict_do_nothing(index_elements=["item_id", "persona"])
+            )
 
+        session.commit()
 
+    # 4) Build digests — independent query + file writes per persona,
+    # so the builds overlap instead of running back to back
+    digests: list[dict] = []
+    if s.personas_enabled:
+        with ThreadPoolExecutor(max_workers=len(s.personas_enabled)) as ex:
+            digests = list(ex.map(build_digest_for_persona, s.personas_enabled))
+
+    # 5) Telegram delivery — a blocking HTTPS POST, so it runs on a
+    # background thread and run_digest returns without waiting. The
+    # thread is non-daemon: interpreter exit joins it, so short-lived
+    # cron runs still deliver before the process dies.
+    threading.Thread(
+        target=_deliver_telegram,
+        args=([d["json_path"] for d in digests],),
+        name="telegram-delivery",
+    ).start()
 
     return {
         "hackernews_inserted": inserted,